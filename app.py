@@ -1,11 +1,22 @@
 import streamlit as st
 from cv_parser import extract_text_from_pdf, extract_text_from_docx
-from ollama_utils import generate_cover_letter_ollama, analyze_cv_advanced, generate_mock_interview_questions_ollama, evaluate_mock_answers_ollama,extract_skills_ollama, extract_skills_from_job_ollama,compare_cv_to_job
-from comparison_utils import get_skills_summary, format_skill_comparison_output, get_skill_match_score
+from ollama_utils import warm_up_model, generate_cover_letter_ollama, analyze_cv_advanced, generate_mock_interview_questions_ollama, evaluate_mock_answers_ollama, extract_cv_and_job_skills_ollama
+from comparison_utils import build_skill_sets, get_skills_summary, format_skill_comparison_output, get_skill_match_score
 from hybrid_skill_matcher import hybrid_skill_comparison, get_hybrid_score
 import re
 import time
+import threading
 st.set_page_config(page_title="Smart Resume Assistant", layout="centered")
+
+
+@st.cache_resource
+def start_model_warm_up():
+    # Runs once per server process, in the background so the UI is not blocked
+    threading.Thread(target=warm_up_model, daemon=True).start()
+    return True
+
+
+start_model_warm_up()
 st.title("\U0001F9E0 Smart Resume Assistant")
 
 # --- Sidebar CV Upload ---
@@ -84,14 +95,14 @@ with tab2:
         elif selected_task == "Skill Match Analysis":
             if st.button("🔍 Analyze Skills"):
                 with st.spinner("\U0001F9E0 Analyzing skill match..."):
-                    cv_skills = extract_skills_ollama(st.session_state.cv_text, job_desc)
-                    job_skills = extract_skills_from_job_ollama(job_desc)
+                    cv_skills, job_skills = extract_cv_and_job_skills_ollama(st.session_state.cv_text, job_desc)
+                    skill_sets = build_skill_sets(cv_skills, job_skills)
 
-                    summary_literal = get_skills_summary(cv_skills, job_skills)
+                    summary_literal = get_skills_summary(cv_skills, job_skills, skill_sets)
                     formatted_literal = format_skill_comparison_output(summary_literal)
                     literal_score = get_skill_match_score(summary_literal)
 
-                    hybrid_result = hybrid_skill_comparison(cv_skills, job_skills)
+                    hybrid_result = hybrid_skill_comparison(cv_skills, job_skills, skill_sets=skill_sets)
                     formatted_hybrid = hybrid_result["formatted_comparison"]
                     hybrid_score = get_hybrid_score(hybrid_result)
 
@@ -1,19 +1,83 @@
 import re
-from ollama_utils import compare_cv_to_job
+from functools import lru_cache
+
+_SKILL_SEPARATORS = re.compile(r'[\s_\-\.]')
+
+# Alias table in normalized form: alias -> canonical skill
+SKILL_ALIASES = {
+    "jupyternotebook": "jupyter",
+    "jupyternotebooks": "jupyter",
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "nodejs",
+    "reactjs": "react",
+    "vuejs": "vue",
+    "golang": "go",
+    "postgres": "postgresql",
+    "mssql": "sqlserver",
+    "microsoftsqlserver": "sqlserver",
+    "sklearn": "scikitlearn",
+    "k8s": "kubernetes",
+    "amazonwebservices": "aws",
+    "googlecloudplatform": "gcp",
+    "googlecloud": "gcp",
+    "microsoftazure": "azure",
+    "msexcel": "excel",
+    "microsoftexcel": "excel",
+    "ml": "machinelearning",
+    "dl": "deeplearning",
+    "nlp": "naturallanguageprocessing",
+    "restapi": "restapis",
+    "restfulapi": "restapis",
+    "restfulapis": "restapis",
+}
 
 
 def normalize_skill(skill: str) -> str:
     """
     Normalize skill strings for better matching.
     """
-    return re.sub(r'[\s_\-\.]', '', skill.lower())
+    return _SKILL_SEPARATORS.sub('', skill.lower())
 
-def get_skills_summary(cv_skills: list, job_skills: list) -> dict:
-    comparison = compare_cv_to_job(cv_skills, job_skills)
 
-    # Normalize skills
-    normalized_cv_skills = {normalize_skill(skill): skill for skill in comparison["cv_skills_raw"]}
-    normalized_job_skills = {normalize_skill(skill): skill for skill in comparison["job_skills_raw"]}
+@lru_cache(maxsize=4096)
+def canonicalize_skill(skill: str) -> str:
+    """
+    Normalized form of a skill with known aliases mapped to one canonical name.
+    """
+    normalized = normalize_skill(skill)
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def build_canonical_skills(skills: list) -> dict:
+    """
+    Returns {canonical skill: first original spelling}, dropping duplicates.
+    """
+    canonical = {}
+    for skill in skills:
+        skill = skill.strip()
+        key = canonicalize_skill(skill)
+        if key and key not in canonical:
+            canonical[key] = skill
+    return canonical
+
+
+def build_skill_sets(cv_skills: list, job_skills: list) -> dict:
+    """
+    Canonical CV and job skill sets, shared by literal and hybrid matching.
+    """
+    return {
+        "cv": build_canonical_skills(cv_skills),
+        "job": build_canonical_skills(job_skills),
+    }
+
+
+def get_skills_summary(cv_skills: list, job_skills: list, skill_sets: dict = None) -> dict:
+    if skill_sets is None:
+        skill_sets = build_skill_sets(cv_skills, job_skills)
+
+    normalized_cv_skills = skill_sets["cv"]
+    normalized_job_skills = skill_sets["job"]
 
     matched_skills = []
     missing_skills = []
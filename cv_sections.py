@@ -0,0 +1,108 @@
+import re
+
+CV_SECTIONS = ["Header", "Summary", "Education", "Experience", "Skills", "Projects", "Certifications", "Extras"]
+
+# Head nouns of section headings (Header is everything before the first heading)
+SECTION_KEYWORDS = {
+    "Summary": ["summary", "profile", "objective"],
+    "Education": ["education", "qualifications"],
+    "Experience": ["experience", "experiences", "employment", "internship", "internships"],
+    "Skills": ["skills", "competencies", "technologies", "tools", "expertise"],
+    "Projects": ["projects"],
+    "Certifications": ["certifications", "certification", "certificates", "courses", "licenses"],
+    "Extras": ["languages", "hobbies", "interests", "volunteering", "volunteer", "activities", "awards", "achievements", "extracurricular"],
+}
+
+# Whole headings whose words aren't all head nouns
+SECTION_HEADING_PHRASES = {
+    "about me": "Summary",
+    "academic background": "Education",
+    "educational background": "Education",
+    "work history": "Experience",
+    "employment history": "Experience",
+}
+
+# Words that may qualify a head noun without changing the section ("Technical Skills")
+HEADING_MODIFIERS = {
+    "work", "professional", "technical", "relevant", "key", "core", "personal", "academic",
+    "selected", "other", "additional", "career", "research", "industry", "soft", "my",
+    "and", "of", "&", "/", "+",
+}
+
+_KEYWORD_TO_SECTION = {
+    keyword: section for section, keywords in SECTION_KEYWORDS.items() for keyword in keywords
+}
+_MAX_HEADING_WORDS = 5
+_NOT_A_HEADING = re.compile(r"[0-9,;•|@.()]")
+_HEADING_WORD = re.compile(r"[a-z]+|[&/+]")
+
+
+def heading_section(line: str):
+    """
+    Returns the section a heading line starts, or None if the line is not a heading.
+
+    A heading is a short line written in upper case, title case, or ending with ':'
+    that is either a known heading phrase or made only of section keywords and
+    modifiers ("Technical Skills & Tools", "Experience and Projects"); the first
+    keyword decides the section. Lines with any other word, such as "Project Manager"
+    or "Programming Languages", are content, not headings.
+    """
+    line = line.strip()
+    words = line.rstrip(":").split()
+    if not words or len(words) > _MAX_HEADING_WORDS or _NOT_A_HEADING.search(line.rstrip(":")):
+        return None
+
+    looks_like_heading = (
+        line.endswith(":")
+        or line.isupper()
+        or all(not word[0].isalpha() or word[0].isupper() or word.lower() in HEADING_MODIFIERS for word in words)
+    )
+    if not looks_like_heading:
+        return None
+
+    tokens = _HEADING_WORD.findall(line.lower())
+    phrase = " ".join(tokens)
+    if phrase in SECTION_HEADING_PHRASES:
+        return SECTION_HEADING_PHRASES[phrase]
+
+    sections = []
+    for token in tokens:
+        if token in _KEYWORD_TO_SECTION:
+            sections.append(_KEYWORD_TO_SECTION[token])
+        elif token not in HEADING_MODIFIERS:
+            return None
+    return sections[0] if sections else None
+
+
+def split_cv_sections(cv_text: str) -> dict:
+    """
+    Split resume text into the standard evaluation sections.
+    Returns {section: text} for every section in CV_SECTIONS ("" if not present).
+    Heading lines are kept as the first line of their section.
+    """
+    sections = {section: [] for section in CV_SECTIONS}
+    current = "Header"
+
+    for line in cv_text.splitlines():
+        section = heading_section(line)
+        if section is not None:
+            current = section
+        sections[current].append(line)
+
+    return {section: "\n".join(lines).strip() for section, lines in sections.items()}
+
+
+def section_has_content(section_text: str) -> bool:
+    """
+    True if the section has any line besides its heading.
+    """
+    lines = [line for line in section_text.splitlines() if line.strip()]
+    return any(heading_section(line) is None for line in lines)
+
+
+def is_segmentation_reliable(sections: dict) -> bool:
+    """
+    False when the headings could not be recognized well enough to evaluate section by section.
+    """
+    found_any = any(sections[section] for section in CV_SECTIONS if section != "Header")
+    return found_any and (section_has_content(sections["Experience"]) or section_has_content(sections["Skills"]))
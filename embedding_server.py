@@ -0,0 +1,275 @@
+import json
+import os
+import queue
+import socket
+import stat
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+# Unix socket the server listens on; it lives in a directory only the owner can access
+EMBEDDING_SERVER_SOCKET = os.environ.get(
+    "EMBEDDING_SERVER_SOCKET",
+    os.path.join(
+        tempfile.gettempdir(),
+        f"smart-resume-embeddings-{os.getuid() if hasattr(os, 'getuid') else 'user'}",
+        "server.sock",
+    ),
+)
+
+# How long the server waits for more requests before encoding a batch
+BATCH_WINDOW_SECONDS = 0.01
+MAX_BATCH_TEXTS = 256
+
+# Limits on a single request, so a client can't make the server allocate unbounded memory
+MAX_REQUEST_TEXTS = 4096
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Texts per client request; each chunk is one short round trip
+CLIENT_CHUNK_TEXTS = MAX_BATCH_TEXTS
+
+# How long a client waits for one chunk before encoding in-process instead
+CLIENT_TIMEOUT_SECONDS = 5.0
+
+# After a failed connection, don't retry the server for this long
+RETRY_COOLDOWN_SECONDS = 5.0
+
+
+# ---------------------- Wire format ----------------------
+#
+# Every message is a 4-byte big-endian length followed by a UTF-8 JSON header.
+#   request:  ["text", "text", ...]
+#   response: {"status": "ok", "shape": [n, dim]} followed by n * dim float32 values
+#             {"status": "error", "error": "..."}
+
+_LENGTH = struct.Struct(">I")
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("connection closed")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _send_json(sock, header, body: bytes = b""):
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(encoded)) + encoded + body)
+
+
+def _recv_json(sock):
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError("message too large")
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+def _is_private(path: str) -> bool:
+    """
+    True if path exists, is owned by the current user, and is not accessible to others.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return not info.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+
+
+# ---------------------- Client ----------------------
+
+# One connection per thread, so a slow request never blocks other threads
+_client_local = threading.local()
+_last_failure = 0.0
+
+
+def _connect():
+    global _last_failure
+    conn = getattr(_client_local, "conn", None)
+    if conn is not None:
+        return conn
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    if time.monotonic() - _last_failure < RETRY_COOLDOWN_SECONDS:
+        return None
+    # Refuse sockets another user could have created in place of the real server
+    if not _is_private(os.path.dirname(EMBEDDING_SERVER_SOCKET)):
+        _last_failure = time.monotonic()
+        return None
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+    try:
+        conn.connect(EMBEDDING_SERVER_SOCKET)
+    except OSError:
+        conn.close()
+        _last_failure = time.monotonic()
+        return None
+    _client_local.conn = conn
+    return conn
+
+
+def _disconnect():
+    global _last_failure
+    conn = getattr(_client_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _client_local.conn = None
+    _last_failure = time.monotonic()
+
+
+def _encode_chunk(conn, texts: list[str]) -> np.ndarray:
+    _send_json(conn, texts)
+    header = _recv_json(conn)
+    if header.get("status") != "ok":
+        raise RuntimeError(header.get("error"))
+    rows, dim = header["shape"]
+    if rows != len(texts) or not 0 < dim * 4 <= MAX_MESSAGE_BYTES // max(rows, 1):
+        raise ValueError("unexpected embedding shape")
+    body = _recv_exact(conn, rows * dim * 4)
+    return np.frombuffer(body, dtype=np.float32).reshape(rows, dim)
+
+
+def encode_remote(texts: list[str]):
+    """
+    Encode texts with the shared embedding server.
+    Large inputs are sent in chunks of CLIENT_CHUNK_TEXTS, so each round trip stays
+    within the server's request limit and the client timeout.
+    Returns a normalized numpy array, or None if the server is not running or too slow.
+    """
+    if not texts:
+        return None
+    conn = _connect()
+    if conn is None:
+        return None
+
+    texts = [str(text) for text in texts]
+    chunks = []
+    try:
+        for start in range(0, len(texts), CLIENT_CHUNK_TEXTS):
+            chunks.append(_encode_chunk(conn, texts[start:start + CLIENT_CHUNK_TEXTS]))
+    except RuntimeError as e:
+        print("⚠️ Embedding server error:", e)
+        return None
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError):
+        # Covers timeouts too; the connection may be mid-message, so drop it
+        _disconnect()
+        return None
+
+    return np.concatenate(chunks)
+
+
+# ---------------------- Server ----------------------
+
+class _EncodeRequest:
+    def __init__(self, texts):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+def _encode_batch(model, batch: list):
+    texts = [text for request in batch for text in request.texts]
+    embeddings = np.asarray(model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+    start = 0
+    for request in batch:
+        end = start + len(request.texts)
+        request.result = embeddings[start:end]
+        start = end
+
+
+def _batch_worker(model, requests_queue: queue.Queue):
+    """
+    Collect requests for a short window and encode them in one forward pass.
+    """
+    while True:
+        batch = [requests_queue.get()]
+        try:
+            total = len(batch[0].texts)
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+
+            while total < MAX_BATCH_TEXTS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                total += len(request.texts)
+
+            _encode_batch(model, batch)
+        except Exception as e:
+            for request in batch:
+                request.error = str(e)
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+def _handle_client(conn, requests_queue: queue.Queue):
+    try:
+        while True:
+            texts = _recv_json(conn)
+            if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+                _send_json(conn, {"status": "error", "error": "expected a non-empty list of strings"})
+                continue
+            if len(texts) > MAX_REQUEST_TEXTS:
+                _send_json(conn, {"status": "error", "error": f"too many texts: {len(texts)} (max {MAX_REQUEST_TEXTS})"})
+                continue
+
+            request = _EncodeRequest(texts)
+            requests_queue.put(request)
+            request.done.wait()
+            if request.error is not None:
+                _send_json(conn, {"status": "error", "error": request.error})
+            else:
+                result = np.ascontiguousarray(request.result, dtype=np.float32)
+                _send_json(conn, {"status": "ok", "shape": list(result.shape)}, result.tobytes())
+    except (OSError, EOFError, ValueError):
+        pass
+    finally:
+        conn.close()
+
+
+def serve(path: str = EMBEDDING_SERVER_SOCKET):
+    """
+    Run the shared embedding server. Blocks forever.
+    """
+    from semantic_matcher import get_model
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private(directory):
+        raise PermissionError(f"{directory} must be owned by you and not accessible to others")
+    if os.path.exists(path):
+        os.remove(path)
+
+    model = get_model()
+    requests_queue = queue.Queue()
+    threading.Thread(target=_batch_worker, args=(model, requests_queue), daemon=True).start()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        os.chmod(path, 0o600)
+        listener.listen()
+        print(f"🧠 Embedding server listening on {path}")
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                continue
+            threading.Thread(target=_handle_client, args=(conn, requests_queue), daemon=True).start()
+
+
+if __name__ == "__main__":
+    serve()
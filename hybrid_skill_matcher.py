@@ -1,7 +1,22 @@
 from semantic_matcher import get_semantic_matches
+from comparison_utils import build_skill_sets
 
-def hybrid_skill_comparison(cv_skills, jd_skills, threshold=0.5) -> dict:
-    matches = get_semantic_matches(cv_skills, jd_skills, threshold=threshold)
+def hybrid_skill_comparison(cv_skills, jd_skills, threshold=0.5, skill_sets: dict = None) -> dict:
+    if skill_sets is None:
+        skill_sets = build_skill_sets(cv_skills, jd_skills)
+
+    canonical_cv = skill_sets["cv"]
+    canonical_jd = skill_sets["job"]
+    cv_skills = list(canonical_cv.values())
+    jd_skills = list(canonical_jd.values())
+
+    # Skills with the same canonical form are exact matches without embedding them
+    literal_matches = [
+        (canonical_cv[key], jd_skill, 1.0)
+        for key, jd_skill in canonical_jd.items() if key in canonical_cv
+    ]
+    unmatched_jd_skills = [jd_skill for key, jd_skill in canonical_jd.items() if key not in canonical_cv]
+    matches = literal_matches + get_semantic_matches(cv_skills, unmatched_jd_skills, threshold=threshold)
 
     matched_jd_skills = set()
     partial_matches = []
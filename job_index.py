@@ -0,0 +1,296 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized, but never overwrite each other's files
+    fcntl = None
+
+from comparison_utils import build_canonical_skills, canonicalize_skill
+from ollama_utils import extract_skills_from_job_ollama
+from semantic_matcher import encode
+
+DEFAULT_INDEX_DIR = "job_index"
+
+_META_FILE = "jobs.json"
+_LOCK_FILE = "index.lock"
+_EMBEDDINGS_FILE = "skill_embeddings.{version}.npy"
+_OWNERS_FILE = "skill_owners.{version}.npy"
+
+
+class JobIndex:
+    """
+    Persistent index of job postings for matching one CV against many jobs.
+
+    Every JD skill of every posting is embedded once and stored in a single
+    contiguous float32 matrix (memory-mapped on load), together with an array
+    mapping each skill row to the posting it belongs to.
+
+    Each save writes a new version of the arrays and then swaps in jobs.json,
+    which names that version; the metadata file is the single commit point.
+    Saves are serialized with a lock file, and the previous version is kept on
+    disk so processes that just read the old jobs.json can still load it.
+    """
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        self.version = None
+        self.jobs = []  # [{"job_id", "title", "skills"}] in posting-row order
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self.owners = np.zeros(0, dtype=np.int32)
+        self._skill_keys = []  # canonical form of every skill row
+        self._load()
+
+    # ---------------------- Persistence ----------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _read_meta(self):
+        if not os.path.exists(self._path(_META_FILE)):
+            return None
+        with open(self._path(_META_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load(self):
+        meta = self._read_meta()
+        if meta is None:
+            return
+
+        version = meta["version"]
+        embeddings = np.load(self._path(_EMBEDDINGS_FILE.format(version=version)), mmap_mode="r")
+        owners = np.load(self._path(_OWNERS_FILE.format(version=version)), mmap_mode="r")
+        jobs = meta["jobs"]
+
+        num_skills = sum(len(job["skills"]) for job in jobs)
+        if not (meta["num_skills"] == num_skills == len(owners) == len(embeddings)):
+            raise ValueError(f"⚠️ Job index in {self.index_dir} is inconsistent (version {version}).")
+
+        self.version = version
+        self.jobs = jobs
+        self.embeddings = embeddings
+        self.owners = owners
+        self._skill_keys = [canonicalize_skill(skill) for job in jobs for skill in job["skills"]]
+
+    def _save_array(self, name: str, array: np.ndarray):
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, self._path(name))
+
+    @contextmanager
+    def _locked(self):
+        with open(self._path(_LOCK_FILE), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _remove_stale_versions(self, keep: set):
+        for name in os.listdir(self.index_dir):
+            for pattern in (_EMBEDDINGS_FILE, _OWNERS_FILE):
+                prefix, suffix = pattern.split("{version}")
+                if name.startswith(prefix) and name.endswith(suffix):
+                    if name[len(prefix):-len(suffix)] not in keep:
+                        os.remove(self._path(name))
+
+    def save(self):
+        """
+        Write the index to disk. Call once after a batch of add/remove operations.
+        Raises RuntimeError if another process saved the index since it was loaded.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        with self._locked():
+            meta = self._read_meta()
+            on_disk_version = meta["version"] if meta else None
+            if on_disk_version != self.version:
+                raise RuntimeError(
+                    f"⚠️ Job index in {self.index_dir} was modified by another process; reload it and retry."
+                )
+
+            # Unique token, so concurrent writers can never overwrite each other's arrays
+            version = uuid.uuid4().hex
+            self._save_array(_EMBEDDINGS_FILE.format(version=version), self.embeddings)
+            self._save_array(_OWNERS_FILE.format(version=version), self.owners)
+
+            meta = {
+                "version": version,
+                "previous_version": self.version,
+                "num_skills": len(self.owners),
+                "jobs": self.jobs,
+            }
+            tmp_path = self._path(_META_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(_META_FILE))
+
+            # Keep the previous version for readers that loaded the old jobs.json
+            self._remove_stale_versions({version, self.version})
+            self._load()
+
+    # ---------------------- Add / Remove ----------------------
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return any(job["job_id"] == job_id for job in self.jobs)
+
+    def add_jobs(self, postings: list, save: bool = True) -> list:
+        """
+        Add (or replace) several postings, embedding all their skills in one batch.
+        Each posting is a dict with "job_id" and either "skills" or "job_desc"
+        (skills are then extracted with Ollama), plus an optional "title".
+        Returns the stored skills of each posting.
+        """
+        # A job_id repeated within the batch is replaced by its last posting
+        postings = list({posting["job_id"]: posting for posting in postings}.values())
+
+        new_jobs = []
+        for posting in postings:
+            skills = posting.get("skills")
+            if skills is None:
+                skills = extract_skills_from_job_ollama(posting.get("job_desc") or "")
+            # One row per canonical skill, so aliases of the same skill aren't counted twice
+            skills = list(build_canonical_skills(skills).values())
+            new_jobs.append({"job_id": posting["job_id"], "title": posting.get("title", ""), "skills": skills})
+
+        new_ids = {job["job_id"] for job in new_jobs}
+        self._remove_rows([i for i, job in enumerate(self.jobs) if job["job_id"] in new_ids])
+
+        all_skills = [skill for job in new_jobs for skill in job["skills"]]
+        if all_skills:
+            new_embeddings = encode(all_skills)
+            if self.embeddings.size:
+                self.embeddings = np.concatenate([self.embeddings, new_embeddings])
+            else:
+                self.embeddings = new_embeddings
+            new_owners = np.concatenate([
+                np.full(len(job["skills"]), len(self.jobs) + offset, dtype=np.int32)
+                for offset, job in enumerate(new_jobs)
+            ])
+            self.owners = np.concatenate([self.owners, new_owners])
+
+        self.jobs.extend(new_jobs)
+        self._skill_keys.extend(canonicalize_skill(skill) for skill in all_skills)
+
+        if save:
+            self.save()
+        return [job["skills"] for job in new_jobs]
+
+    def add_job(self, job_id: str, job_desc: str = None, skills: list = None, title: str = "", save: bool = True) -> list:
+        """
+        Add (or replace) a single posting. Returns the stored skills.
+        """
+        posting = {"job_id": job_id, "job_desc": job_desc, "skills": skills, "title": title}
+        return self.add_jobs([posting], save=save)[0]
+
+    def remove_jobs(self, job_ids: list, save: bool = True) -> int:
+        """
+        Remove postings and their skill rows. Returns how many were removed.
+        """
+        job_ids = set(job_ids)
+        rows = [i for i, job in enumerate(self.jobs) if job["job_id"] in job_ids]
+        self._remove_rows(rows)
+        if rows and save:
+            self.save()
+        return len(rows)
+
+    def remove_job(self, job_id: str, save: bool = True) -> bool:
+        """
+        Remove a posting. Returns False if it was not indexed.
+        """
+        return self.remove_jobs([job_id], save=save) > 0
+
+    def _remove_rows(self, rows: list):
+        if not rows:
+            return
+        owners = np.asarray(self.owners)
+        keep = ~np.isin(owners, rows)
+        # Postings after a removed one shift up by the number of removed rows before them
+        shift = np.searchsorted(np.array(sorted(rows)), owners[keep])
+        self.embeddings = np.asarray(self.embeddings)[keep]
+        self.owners = (owners[keep] - shift).astype(np.int32)
+        self._skill_keys = [key for key, kept in zip(self._skill_keys, keep) if kept]
+        removed = set(rows)
+        self.jobs = [job for i, job in enumerate(self.jobs) if i not in removed]
+
+    # ---------------------- Matching ----------------------
+
+    def top_matches(self, cv_skills: list, k: int = 5, threshold: float = 0.5) -> list:
+        """
+        Score every indexed posting against the CV skills in one vectorized pass.
+
+        A JD skill counts as matched if a CV skill has the same canonical form
+        (as in literal matching) or a similarity >= threshold. The score is the
+        percentage of the posting's JD skills that are matched. Unlike
+        get_hybrid_score, a JD skill matched by several CV skills counts once.
+        Returns the top-k postings sorted by score.
+        """
+        if not self.jobs:
+            return []
+
+        canonical_cv = build_canonical_skills(cv_skills or [])
+        cv_skills = list(canonical_cv.values())
+
+        num_jobs = len(self.jobs)
+        num_skills = len(self.owners)
+        skill_counts = np.bincount(self.owners, minlength=num_jobs)
+
+        if cv_skills and self.embeddings.size:
+            cv_embeddings = encode(cv_skills)
+            # (num JD skills, num CV skills); embeddings are normalized
+            similarity = np.asarray(self.embeddings) @ cv_embeddings.T
+            best_score = similarity.max(axis=1)
+            best_cv = similarity.argmax(axis=1)
+        else:
+            best_score = np.zeros(num_skills, dtype=np.float32)
+            best_cv = np.zeros(num_skills, dtype=np.int64)
+
+        # Canonical-equal skills are exact matches regardless of their embeddings
+        cv_positions = {key: i for i, key in enumerate(canonical_cv)}
+        literal = np.array([key in cv_positions for key in self._skill_keys], dtype=bool)
+        if literal.any():
+            literal_rows = np.flatnonzero(literal)
+            best_score[literal_rows] = 1.0
+            best_cv[literal_rows] = [cv_positions[self._skill_keys[i]] for i in literal_rows]
+
+        is_matched = literal | (best_score >= threshold)
+        matched_counts = np.bincount(self.owners, weights=is_matched, minlength=num_jobs)
+        scores = np.divide(
+            matched_counts, skill_counts,
+            out=np.zeros(num_jobs), where=skill_counts > 0,
+        ) * 100
+
+        top = np.argsort(-scores, kind="stable")[:k]
+
+        starts = np.concatenate([[0], np.cumsum(skill_counts)])
+        results = []
+        for row in top:
+            job = self.jobs[row]
+            # Skill rows of a posting are contiguous and in the same order as job["skills"]
+            start = starts[row]
+            matched_skills = []
+            missing_skills = []
+            for offset, jd_skill in enumerate(job["skills"]):
+                i = start + offset
+                if is_matched[i]:
+                    matched_skills.append((cv_skills[best_cv[i]], jd_skill, round(float(best_score[i]), 2)))
+                else:
+                    missing_skills.append(jd_skill)
+            results.append({
+                "job_id": job["job_id"],
+                "title": job["title"],
+                "hybrid_score": round(float(scores[row]), 2),
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+            })
+
+        return results
@@ -1,10 +1,92 @@
 import requests
 import ast
+import copy
+import hashlib
+from collections import OrderedDict
 from ast import literal_eval
 import re
-from semantic_matcher import is_valid_answer
+from semantic_matcher import are_valid_answers
+from cv_sections import CV_SECTIONS, split_cv_sections, is_segmentation_reliable, section_has_content
 
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
+OLLAMA_MODEL = "mistral"
+
+# Keep the model loaded between bursts of requests instead of reloading it
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Per-task generation settings: output cap (num_predict) and sampling temperature.
+# Caps are sized to the longest output each prompt asks for, so normal answers
+# are never cut off (a truncated list or dict fails to parse).
+GENERATION_PROFILES = {
+    "extraction": {"num_predict": 512, "temperature": 0.0},
+    "fused_extraction": {"num_predict": 1024, "temperature": 0.0},
+    "section_evaluation": {"num_predict": 300, "temperature": 0.2},
+    "evaluation": {"num_predict": 1536, "temperature": 0.2},
+    "whole_evaluation": {"num_predict": 2560, "temperature": 0.2},
+    "cover_letter": {"num_predict": 1024, "temperature": 0.8},
+    "interview_questions": {"num_predict": 768, "temperature": 0.9},
+    "answer_evaluation": {"num_predict": 4608, "temperature": 0.2},
+}
+
+# Every task uses the same context window, because Ollama reloads the model
+# whenever num_ctx changes. It fits the largest normal prompt (a resume plus a
+# full set of interview answers and the answer-evaluation output budget).
+DEFAULT_NUM_CTX = 12288
+MAX_NUM_CTX = 32768
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_num_ctx(prompt: str, num_predict: int) -> int:
+    """
+    DEFAULT_NUM_CTX, doubled only for prompts too large to fit in it with their output budget.
+    """
+    needed = int(len(prompt) / CHARS_PER_TOKEN) + num_predict
+    num_ctx = DEFAULT_NUM_CTX
+    while num_ctx < needed and num_ctx < MAX_NUM_CTX:
+        num_ctx *= 2
+    return num_ctx
+
+
+def build_generate_request(prompt: str, profile: str) -> dict:
+    """
+    Build the /api/generate payload for a task using its generation profile.
+    """
+    settings = GENERATION_PROFILES[profile]
+    return {
+        "model": OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {
+            "num_ctx": estimate_num_ctx(prompt, settings["num_predict"]),
+            "num_predict": settings["num_predict"],
+            "temperature": settings["temperature"],
+        },
+    }
+
+
+def warm_up_model() -> bool:
+    """
+    Load the model into memory and pin it with keep_alive.
+    An empty prompt makes Ollama load the model without generating anything.
+    It uses the same num_ctx as regular requests, so they don't trigger a reload.
+    """
+    try:
+        response = requests.post(
+            OLLAMA_API_URL,
+            json={
+                "model": OLLAMA_MODEL,
+                "prompt": "",
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE,
+                "options": {"num_ctx": DEFAULT_NUM_CTX},
+            },
+        )
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print("⚠️ Failed to warm up model:", e)
+        return False
 
 
 def generate_cover_letter_ollama(cv_text: str, job_desc: str, language: str = "en") -> str:
@@ -46,7 +128,7 @@ The final output must look like a complete, high-quality cover letter suitable f
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "cover_letter"),
         )
         response.raise_for_status()
         return response.json()["response"].strip()
@@ -98,7 +180,7 @@ Use this job description to:
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "extraction"),
         )
         response.raise_for_status()
         output = response.json()["response"].strip()
@@ -153,7 +235,7 @@ Job Description:
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "extraction"),
         )
         response.raise_for_status()
         output = response.json()["response"].strip()
@@ -175,6 +257,63 @@ Job Description:
 
 
 
+def extract_cv_and_job_skills_ollama(cv_text: str, job_desc: str) -> tuple[list, list]:
+    """
+    Extract resume skills and job description skills in a single Ollama call,
+    so the job description is only processed once.
+    Returns (cv_skills, job_skills).
+    """
+    prompt = f"""
+You are an expert NLP assistant and HR analyst.
+
+Your task is to extract **hard/technical and domain-specific skills** from BOTH the job description and the resume below.
+
+Instructions:
+- Only include specific tools, technologies, programming languages, frameworks, platforms, and professional domain skills.
+- Ignore soft skills (like communication, leadership, teamwork) and generic words (like motivated, dedicated).
+- Do NOT invent or infer skills — extract only those explicitly mentioned in each text.
+- Job skills are the **reference naming format**: use the exact wording from the job description.
+- If a resume skill also appears in the job description under a different name, return it using the job description's name.
+- Example: If the CV says "Jupyter Notebooks" and the job says "Jupyter", return "Jupyter".
+- Do NOT include duplicates or explanations.
+- IMPORTANT: Return the result as a valid Python dictionary in **one line only**, exactly like:
+  {{"cv_skills": ["Python", "Pandas"], "job_skills": ["Python", "AWS"]}}
+- Do not add any explanation or introduction. Just output the dictionary directly.
+
+Job Description:
+{job_desc}
+
+Resume Text:
+{cv_text}
+"""
+
+    try:
+        response = requests.post(
+            OLLAMA_API_URL,
+            json=build_generate_request(prompt, "fused_extraction"),
+        )
+        response.raise_for_status()
+        output = response.json()["response"].strip()
+
+        # Try to isolate the dictionary using regex if it's embedded
+        match = re.search(r"\{.*\}", output, re.DOTALL)
+        if match:
+            output = match.group(0)
+
+        parsed = literal_eval(output)
+        if isinstance(parsed, dict):
+            cv_skills = parsed.get("cv_skills") or []
+            job_skills = parsed.get("job_skills") or []
+            return list(set(map(str.strip, cv_skills))), list(set(map(str.strip, job_skills)))
+
+        return [], []
+
+    except Exception as e:
+        print("⚠️ Failed to extract skills:", e)
+        return [], []
+
+
+
 def compare_cv_to_job(cv_skills, job_skills) -> dict:
     """
     Compares CV skills with job description skills using Ollama-extracted data.
@@ -207,7 +346,89 @@ def compare_cv_to_job(cv_skills, job_skills) -> dict:
 
 
 
-def analyze_cv_advanced(cv_text: str, job_title: str = None) -> dict:
+SECTION_GUIDANCE = {
+    "Header": "name, contact info, layout",
+    "Summary": "quality, relevance",
+    "Education": "relevance, structure, detail",
+    "Experience": "impact, clarity, action verbs, metrics",
+    "Skills": "relevance, specificity",
+    "Projects": "quality, connection to role",
+    "Certifications": "strength and relevance",
+    "Extras": "languages, hobbies, volunteering — if relevant",
+}
+
+
+class _LRUCache:
+    """
+    Small bounded cache that hands out copies, so callers can't mutate cached results.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key):
+        if key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return copy.deepcopy(self._items[key])
+
+    def put(self, key, value):
+        self._items[key] = copy.deepcopy(value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+# Section feedback keyed by hash of (job title, section, section text)
+_section_feedback_cache = _LRUCache(maxsize=512)
+# Overall evaluation keyed by hash of (job title, all section hashes) or of the whole CV
+_overall_evaluation_cache = _LRUCache(maxsize=64)
+
+
+def _content_hash(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _evaluate_cv_section(section: str, section_text: str, job_title: str = None) -> str:
+    """
+    Generate feedback for a single resume section using Ollama.
+    """
+    prompt = f"""
+You are a professional career coach and hiring manager with 15+ years of experience.
+
+Evaluate ONLY the "{section}" section of a resume{' for the role: ' + job_title if job_title else ''}.
+Focus on: {SECTION_GUIDANCE[section]}.
+
+Instructions:
+- Write 2 to 4 sentences of specific, constructive feedback.
+- Do not rewrite the section and do not add any introduction.
+
+{section} Section:
+{section_text}
+"""
+
+    try:
+        response = requests.post(
+            OLLAMA_API_URL,
+            json=build_generate_request(prompt, "section_evaluation"),
+        )
+        response.raise_for_status()
+        return response.json()["response"].strip()
+    except Exception as e:
+        print("⚠️ Failed to evaluate section:", e)
+        return None
+
+
+def _analyze_cv_whole(cv_text: str, job_title: str = None) -> dict:
+    """
+    Evaluate the whole resume in a single call (used when it can't be split into sections).
+    """
+    key = _content_hash("whole", job_title or "", cv_text)
+    cached = _overall_evaluation_cache.get(key)
+    if cached is not None:
+        return cached
+
     prompt = f"""
 You are a professional career coach and hiring manager with 15+ years of experience.
 
@@ -250,7 +471,7 @@ Resume Text:
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "whole_evaluation"),
         )
         response.raise_for_status()
         output = response.json()["response"]
@@ -258,6 +479,7 @@ Resume Text:
         match = re.search(r"\{.*\}", output, re.DOTALL)
         if match:
             parsed = literal_eval(match.group(0))
+            _overall_evaluation_cache.put(key, parsed)
             return parsed
         return {"error": "⚠️ Failed to parse structured response."}
 
@@ -265,6 +487,98 @@ Resume Text:
         return {"error": str(e)}
 
 
+def analyze_cv_advanced(cv_text: str, job_title: str = None) -> dict:
+    """
+    Evaluate a resume section by section. Feedback for each section is cached by
+    content hash, so re-uploading an edited CV only re-evaluates changed sections;
+    the overall rating and summary are then built from the section feedback.
+    Resumes whose headings can't be recognized are evaluated as a whole instead.
+    """
+    job_title = job_title or ""
+    sections = split_cv_sections(cv_text)
+    if not is_segmentation_reliable(sections):
+        return _analyze_cv_whole(cv_text, job_title)
+
+    section_feedback = {}
+    section_hashes = []
+    for section in CV_SECTIONS:
+        section_text = sections[section]
+        if not section_has_content(section_text):
+            section_feedback[section] = "Not present in the resume."
+            section_hashes.append("")
+            continue
+
+        key = _content_hash(job_title, section, section_text)
+        feedback = _section_feedback_cache.get(key)
+        if feedback is None:
+            feedback = _evaluate_cv_section(section, section_text, job_title)
+            if feedback is None:
+                return {"error": f"⚠️ Failed to evaluate the {section} section."}
+            _section_feedback_cache.put(key, feedback)
+        section_feedback[section] = feedback
+        section_hashes.append(key)
+
+    overall_key = _content_hash(job_title, *section_hashes)
+    cached = _overall_evaluation_cache.get(overall_key)
+    if cached is not None:
+        return {**cached, "section_feedback": section_feedback}
+
+    present = [section for section in CV_SECTIONS if sections[section]]
+    feedback_block = "\n".join(f"- {section}: {feedback}" for section, feedback in section_feedback.items())
+
+    prompt = f"""
+You are a professional career coach and hiring manager with 15+ years of experience.
+
+Below is section-by-section feedback on a resume. Combine it into an overall structured evaluation.
+
+Resume facts:
+- Sections present: {', '.join(present) or 'None'}
+- Total length: {len(cv_text.split())} words
+
+Your response MUST be a valid Python dictionary with the following keys:
+
+{{
+  "overall_rating": float (score between 0.0 and 10.0),
+  "summary": str (brief summary of the resume's effectiveness),
+  "fit_for_role": str (assessment of how well this CV aligns with the job role{' for: ' + job_title if job_title else ''}),
+  "evaluation": {{
+    "structure": str (comment on formatting, logical flow, and sections),
+    "clarity": str (comment on how clearly the candidate communicates ideas and experience),
+    "language_quality": str (comment on grammar, tone, and vocabulary),
+    "length": str (too long/short or appropriate),
+    "consistency": str (comment on how consistent formatting and content are)
+  }},
+  "strengths": list of str (bullet points),
+  "weaknesses": list of str (bullet points),
+  "recommendations": list of str (concrete suggestions for improvement)
+}}
+
+Section Feedback:
+{feedback_block}
+"""
+    if job_title:
+        prompt = f"Target Job Title: {job_title}\n\n" + prompt
+
+    try:
+        response = requests.post(
+            OLLAMA_API_URL,
+            json=build_generate_request(prompt, "evaluation"),
+        )
+        response.raise_for_status()
+        output = response.json()["response"]
+
+        match = re.search(r"\{.*\}", output, re.DOTALL)
+        if match:
+            parsed = literal_eval(match.group(0))
+            parsed.pop("section_feedback", None)
+            _overall_evaluation_cache.put(overall_key, parsed)
+            return {**parsed, "section_feedback": section_feedback}
+        return {"error": "⚠️ Failed to parse structured response."}
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
 
 
 def generate_mock_interview_questions_ollama(cv_text: str, job_title: str, language: str = "en") -> str:
@@ -312,7 +626,7 @@ Only return the final list of questions in plain text.
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "interview_questions"),
         )
         response.raise_for_status()
         return response.json()["response"].strip()
@@ -337,9 +651,11 @@ def evaluate_mock_answers_ollama(cv_text: str, job_title: str, questions: list[s
     """
 
 
+    verdicts = are_valid_answers(questions, answers)
+
     qa_block = ""
     for i, (q, a) in enumerate(zip(questions, answers)):
-        is_valid, score = is_valid_answer(q, a)
+        is_valid, score = verdicts[i]
         formatted_answer = a if is_valid else "No valid answer was provided."
         qa_block += f"Q{i+1}: {q}\nA{i+1}: {formatted_answer}\n"
 
@@ -422,7 +738,7 @@ Your response should be in {language.upper()}, clear, objective, and professiona
     try:
         response = requests.post(
             OLLAMA_API_URL,
-            json={"model": "mistral", "prompt": prompt, "stream": False},
+            json=build_generate_request(prompt, "answer_evaluation"),
         )
         response.raise_for_status()
         return response.json()["response"].strip()
@@ -1,9 +1,32 @@
-from sentence_transformers import SentenceTransformer, util
-import torch
+import numpy as np
+from embedding_server import encode_remote
 
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Loaded lazily so processes served by the embedding server never import torch
+_model = None
+
+
+def get_model():
+    """
+    Load the sentence-transformers model once per process.
+    """
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+
+def encode(texts: list[str]) -> np.ndarray:
+    """
+    Returns L2-normalized embeddings, using the shared embedding server if it is running.
+    """
+    embeddings = encode_remote(texts)
+    if embeddings is None:
+        embeddings = get_model().encode(texts, normalize_embeddings=True)
+    return np.asarray(embeddings, dtype=np.float32)
 
-# Load model once
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def get_semantic_matches(cv_skills, jd_skills, threshold=0.5):
     """
@@ -18,16 +41,18 @@ def get_semantic_matches(cv_skills, jd_skills, threshold=0.5):
     if isinstance(jd_skills, str):
         jd_skills = [jd_skills]
 
-    cv_embeddings = model.encode(cv_skills, convert_to_tensor=True)
-    jd_embeddings = model.encode(jd_skills, convert_to_tensor=True)
+    embeddings = encode(list(cv_skills) + list(jd_skills))
+    cv_embeddings = embeddings[:len(cv_skills)]
+    jd_embeddings = embeddings[len(cv_skills):]
 
-    similarity_matrix = util.pytorch_cos_sim(cv_embeddings, jd_embeddings)
+    # Embeddings are normalized, so the dot product is the cosine similarity
+    similarity_matrix = cv_embeddings @ jd_embeddings.T
 
     matched = []
     for i, cv_skill in enumerate(cv_skills):
         for j, jd_skill in enumerate(jd_skills):
             try:
-                sim_score = similarity_matrix[i][j].item()
+                sim_score = float(similarity_matrix[i][j])
                 if sim_score >= threshold:
                     matched.append((cv_skill, jd_skill, round(sim_score, 2)))
             except IndexError:
@@ -45,10 +70,32 @@ def is_valid_answer(question: str, answer: str, threshold: float = 0.3) -> tuple
     Measures the similarity between the answer and the question using BERT.
     If the score is below the threshold: the answer is considered invalid.
     """
-    if not answer.strip() or len(answer.split()) < 5:
-        return False, 0.0  
+    return are_valid_answers([question], [answer], threshold=threshold)[0]
+
+
+def are_valid_answers(questions: list[str], answers: list[str], threshold: float = 0.3) -> list[tuple[bool, float]]:
+    """
+    Batched version of is_valid_answer: encodes all questions and answers in one batch
+    and computes the paired similarities at once.
+    Returns a (is_valid, similarity) tuple per question-answer pair.
+    """
+    results = [(False, 0.0)] * min(len(questions), len(answers))
+
+    # Blank or very short answers are invalid without encoding them
+    pairs = [
+        (i, q, a) for i, (q, a) in enumerate(zip(questions, answers))
+        if a.strip() and len(a.split()) >= 5
+    ]
+    if not pairs:
+        return results
+
+    embeddings = encode([q for _, q, _ in pairs] + [a for _, _, a in pairs])
+    question_embeddings = embeddings[:len(pairs)]
+    answer_embeddings = embeddings[len(pairs):]
+    similarities = np.einsum("ij,ij->i", question_embeddings, answer_embeddings)
 
-    embeddings = model.encode([question, answer], convert_to_tensor=True)
-    similarity = util.pytorch_cos_sim(embeddings[0], embeddings[1]).item()
+    for (i, _, _), similarity in zip(pairs, similarities):
+        similarity = float(similarity)
+        results[i] = (similarity >= threshold, similarity)
 
-    return similarity >= threshold, similarity
+    return results
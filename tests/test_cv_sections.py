@@ -0,0 +1,86 @@
+from cv_sections import heading_section, is_segmentation_reliable, section_has_content, split_cv_sections
+
+CV_TEXT = """Jane Smith
+jane.smith@example.com | +20 100 000 0000
+
+PROFESSIONAL SUMMARY
+Data analyst with five years of experience in retail analytics.
+
+Work Experience
+Acme Retail — 2019 to 2024
+Project Manager
+- Led a team of four analysts on pricing projects.
+Customer Experience Lead
+- Built churn dashboards in Power BI.
+Head Of Education Programs
+- Ran internal SQL training.
+
+Education
+B.Sc. Economic History
+Cairo University, 2018
+
+Technical Skills & Tools
+Programming Languages
+Python, SQL
+Soft Skills
+Communication
+
+Languages:
+Arabic, English
+"""
+
+
+def test_split_realistic_cv():
+    sections = split_cv_sections(CV_TEXT)
+
+    assert sections["Header"].startswith("Jane Smith")
+    assert "retail analytics" in sections["Summary"]
+
+    # Job titles that contain section keywords stay in Experience
+    for line in ["Project Manager", "Led a team of four analysts", "Customer Experience Lead",
+                 "Head Of Education Programs", "Ran internal SQL training"]:
+        assert line in sections["Experience"]
+    assert sections["Projects"] == ""
+
+    assert "B.Sc. Economic History" in sections["Education"]
+    assert "Cairo University" in sections["Education"]
+
+    # Sub-headings stay inside Skills
+    assert "Programming Languages\nPython, SQL" in sections["Skills"]
+    assert "Soft Skills" in sections["Skills"]
+
+    assert sections["Extras"] == "Languages:\nArabic, English"
+    assert is_segmentation_reliable(sections)
+
+
+def test_no_line_is_dropped():
+    sections = split_cv_sections(CV_TEXT)
+    kept = [line for text in sections.values() for line in text.splitlines()]
+    original = [line for line in CV_TEXT.splitlines() if line.strip()]
+    assert sorted(line for line in kept if line.strip()) == sorted(original)
+
+
+def test_heading_section():
+    assert heading_section("Technical Skills & Tools") == "Skills"
+    assert heading_section("Experience and Projects") == "Experience"
+    assert heading_section("EDUCATION") == "Education"
+    assert heading_section("Employment History") == "Experience"
+    assert heading_section("Certifications:") == "Certifications"
+
+    assert heading_section("Project Manager") is None
+    assert heading_section("B.Sc. Economic History") is None
+    assert heading_section("Programming Languages") is None
+    assert heading_section("Customer Experience Lead") is None
+    assert heading_section("Head Of Education Programs") is None
+    assert heading_section("skills in python and sql") is None
+
+
+def test_unrecognized_headings_are_unreliable():
+    sections = split_cv_sections("Jane Smith\nBackground\nDid many things\nAbilities\nPython")
+    assert not is_segmentation_reliable(sections)
+
+
+def test_heading_only_section_has_no_content():
+    sections = split_cv_sections("Jane Smith\nExperience\nSkills\nPython")
+    assert not section_has_content(sections["Experience"])
+    assert section_has_content(sections["Skills"])
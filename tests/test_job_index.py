@@ -0,0 +1,71 @@
+import zlib
+
+import numpy as np
+import pytest
+
+import job_index
+from job_index import JobIndex
+
+
+def fake_encode(texts):
+    # Deterministic random unit vectors; different skills are far apart
+    vectors = np.array([
+        np.random.default_rng(zlib.crc32(text.lower().encode())).standard_normal(32)
+        for text in texts
+    ], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_index, "encode", fake_encode)
+    return JobIndex(str(tmp_path))
+
+
+def test_add_jobs_replaces_duplicate_job_ids(index):
+    index.add_jobs([
+        {"job_id": "a", "skills": ["Python"]},
+        {"job_id": "a", "skills": ["Java", "Spring"]},
+    ])
+    assert [job["job_id"] for job in index.jobs] == ["a"]
+    assert index.jobs[0]["skills"] == ["Java", "Spring"]
+    assert len(index.owners) == 2
+
+
+def test_reload_and_match(index, tmp_path):
+    index.add_jobs([
+        {"job_id": "a", "skills": ["Python", "Jupyter", "AWS"]},
+        {"job_id": "b", "skills": ["Java", "Spring"]},
+    ])
+    index.remove_job("b")
+
+    reloaded = JobIndex(str(tmp_path))
+    assert [job["job_id"] for job in reloaded.jobs] == ["a"]
+
+    top = reloaded.top_matches(["python", "Jupyter Notebooks"], k=1, threshold=0.999)
+    assert top[0]["job_id"] == "a"
+    assert top[0]["hybrid_score"] == pytest.approx(66.67)
+    assert top[0]["missing_skills"] == ["AWS"]
+
+
+def test_save_keeps_previous_version(index, tmp_path):
+    index.add_job("a", skills=["Python"])
+    first_version = index.version
+    index.add_job("b", skills=["Java"])
+    second_version = index.version
+    index.add_job("c", skills=["Go"])
+
+    arrays = {name for name in (tmp_path).iterdir() if name.suffix == ".npy"}
+    versions = {path.name.split(".")[1] for path in arrays}
+    assert versions == {second_version, index.version}
+    assert first_version not in versions
+
+
+def test_save_refuses_stale_index(index, tmp_path):
+    other = JobIndex(str(tmp_path))
+    index.add_job("a", skills=["Python"])
+
+    other.add_job("b", skills=["Java"], save=False)
+    with pytest.raises(RuntimeError):
+        other.save()
+    assert [job["job_id"] for job in JobIndex(str(tmp_path)).jobs] == ["a"]